@@ -0,0 +1,120 @@
+"""
+This module creates and configures the Flask application for the vertical jump tracking API.
+
+Utilities:
+- set_sqlite_pragmas(dbapi_connection, connection_record):
+    Configures every new SQLite connection for concurrent reads.
+- create_app(config): Creates and configures the Flask application.
+
+Dependencies:
+- Flask: For creating the web application and handling HTTP requests.
+- Flask-JWT-Extended: For handling JSON Web Tokens (JWT) for authentication.
+- SQLAlchemy: For database interactions.
+- Flask-Caching: For caching responses.
+- orjson: For JSON serialization.
+"""
+
+import multiprocessing
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from flask import Flask
+from flask_caching import Cache
+from flask_jwt_extended import JWTManager
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from models import db
+from routes import create_routes
+from utils import ORJSONProvider
+
+
+@event.listens_for(Engine, 'connect')
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Configures every new SQLite connection for concurrent reads.
+
+    WAL mode lets readers proceed while a jump is being written, and with WAL
+    synchronous=NORMAL only syncs at checkpoints instead of on every commit.
+    The page cache and memory map are enlarged so that hot pages are served
+    from memory.
+
+    Parameters:
+    - dbapi_connection: The new DBAPI connection.
+    - connection_record: The pool's record of the connection.
+
+    Returns:
+    - None
+    """
+    if not isinstance(dbapi_connection, sqlite3.Connection):
+        return
+
+    cursor = dbapi_connection.cursor()
+    cursor.execute('PRAGMA journal_mode=WAL')
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA cache_size=-64000')
+    cursor.execute('PRAGMA mmap_size=268435456')
+    cursor.close()
+
+
+def create_app(config=None):
+    """
+    Creates and configures the Flask application.
+
+    Everything that the app needs, including its worker pools, is built here
+    rather than at import time. Plot worker processes import the main module
+    on startup, and must not build an app of their own.
+
+    Parameters:
+    - config (Optional[dict[str, Any]]): Settings that override the defaults below.
+
+    Returns:
+    - Flask: The configured Flask application.
+    """
+    app = Flask(__name__)
+    app.json = ORJSONProvider(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///sample.db'
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+        'pool_size': 20,
+        'max_overflow': 10,
+        'pool_timeout': 5,
+        'pool_recycle': 3600,
+        'pool_pre_ping': True
+    }
+    app.config['JWT_SECRET_KEY'] = '6BoMuJ42TFDNAHNARSRtYjuTePr0DEwF'
+    # Tokens are only read from the Authorization header, so none of the
+    # cookie and CSRF handling applies to this JSON API.
+    app.config['JWT_TOKEN_LOCATION'] = ['headers']
+    app.config['JWT_COOKIE_CSRF_PROTECT'] = False
+    app.config['JWT_CSRF_IN_COOKIES'] = False
+    # bcrypt cost factor; hashing time doubles with each increment.
+    app.config['BCRYPT_COST'] = 12
+    # Number of processes that render plots in parallel.
+    app.config['PLOT_WORKERS'] = 2
+    # Set CACHE_REDIS_URL to share cached responses between workers through Redis.
+    if 'CACHE_REDIS_URL' in os.environ:
+        app.config['CACHE_TYPE'] = 'RedisCache'
+        app.config['CACHE_REDIS_URL'] = os.environ['CACHE_REDIS_URL']
+    else:
+        app.config['CACHE_TYPE'] = 'SimpleCache'
+    if config is not None:
+        app.config.update(config)
+
+    db.init_app(app)
+
+    # bcrypt releases the GIL while hashing, so a bounded pool lets hashing
+    # overlap with other requests without spawning a thread per login.
+    app.extensions['bcrypt_pool'] = ThreadPoolExecutor(max_workers=os.cpu_count())
+    # Matplotlib holds the GIL while rendering, so plots are drawn in separate
+    # processes. Workers are spawned rather than forked from this threaded process.
+    app.extensions['plot_pool'] = ProcessPoolExecutor(
+        max_workers=app.config['PLOT_WORKERS'],
+        mp_context=multiprocessing.get_context('spawn')
+    )
+
+    JWTManager(app)
+
+    cache = Cache(app)
+
+    create_routes(app, db, cache)
+
+    return app
@@ -4,6 +4,7 @@ This module defines the database models for the vertical jump tracking applicati
 Models:
 - User: Represents a user in the system.
 - VerticalJumpRecord: Represents a record of a vertical jump performed by a user.
+- DailyJumpSummary: Represents per-day aggregates of a user's vertical jumps of one variant.
 
 Dependencies:
 - SQLAlchemy: For database interactions.
@@ -13,6 +14,7 @@ Author:
 """
 
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.sql import func
 from datetime import datetime, timezone
 
 db = SQLAlchemy()
@@ -31,6 +33,9 @@ class User(db.Model):
     Relationships:
     - vertical_jump_records (list of VerticalJumpRecord): The vertical jump records associated with this user. This relationship
       supports cascading delete operations, so all associated records are deleted when the user is removed.
+      Implicit lazy loading is disabled; load the records explicitly with selectinload(User.vertical_jump_records).
+    - daily_jump_summaries (list of DailyJumpSummary): The daily aggregates of this user's jumps. Deleted along with
+      the user. Implicit lazy loading is disabled.
     """
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(20), nullable=False, unique=True)
@@ -40,7 +45,16 @@ class User(db.Model):
     vertical_jump_records = db.relationship(
         'VerticalJumpRecord',
         uselist=True,
-        cascade='all, delete'
+        cascade='all, delete',
+        lazy='raise_on_sql',
+        back_populates='user'
+    )
+
+    daily_jump_summaries = db.relationship(
+        'DailyJumpSummary',
+        uselist=True,
+        cascade='all, delete',
+        lazy='raise_on_sql'
     )
 
 
@@ -51,7 +65,8 @@ class VerticalJumpRecord(db.Model):
     Attributes:
     - id (int): The unique identifier for the jump record.
     - height (float): The height of the jump, calculated based on the hang-time and user data.
-    - timestamp (datetime): The date and time when the jump was recorded. Defaults to the current time in UTC.
+    - timestamp (datetime): The date and time when the jump was recorded. Defaults to the current time in UTC,
+      evaluated at insert time.
     - variant (str): The type of jump performed. Must be either 'MAX' (maximum approach jump) or 'CMJ' (counter movement jump).
     - weight (float, optional): The body weight of the user at the time of the jump. This value is optional.
     - note (str, optional): Any additional notes provided by the user about the jump.
@@ -60,13 +75,60 @@ class VerticalJumpRecord(db.Model):
 
     Relationships:
     - user (User): The user who owns this jump record. This is a foreign key relationship with the `User` model.
+
+    Indexes:
+    - ix_vjr_user_ts: (user_id, timestamp), for per-user queries ordered by date.
+    - ix_vjr_user_height: (user_id, height), for per-user queries ordered or aggregated by height.
+    - ix_vjr_user_variant_ts: (user_id, variant, timestamp), for per-user queries filtered by variant.
+    - ix_vjr_user_date: (user_id, date(timestamp)), for per-user queries grouped by day.
     """
     id = db.Column(db.Integer, primary_key=True)
     height = db.Column(db.Float, nullable=False)
-    timestamp = db.Column(db.DateTime, default=datetime.now(timezone.utc))
+    timestamp = db.Column(
+        db.DateTime,
+        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        nullable=False
+    )
     variant = db.Column(db.String(3), nullable=False)
     weight = db.Column(db.Float, nullable=True)
     note = db.Column(db.Text, nullable=True)
     user_id = db.Column(db.Integer,
         db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False
     )
+
+    user = db.relationship('User', back_populates='vertical_jump_records')
+
+    __table_args__ = (
+        db.Index('ix_vjr_user_ts', 'user_id', 'timestamp'),
+        db.Index('ix_vjr_user_height', 'user_id', 'height'),
+        db.Index('ix_vjr_user_variant_ts', 'user_id', 'variant', 'timestamp'),
+        db.Index('ix_vjr_user_date', 'user_id', func.date(timestamp)),
+    )
+
+
+class DailyJumpSummary(db.Model):
+    """
+    Represents the aggregates of a user's vertical jumps of one variant on one day (UTC).
+
+    Rows are maintained by utils.insert_jumps() whenever a jump is recorded, so that
+    per-day queries read one row per day instead of grouping every VerticalJumpRecord.
+
+    Attributes:
+    - user_id (int): The ID of the user who performed the jumps. Part of the primary key.
+    - day (date): The UTC date on which the jumps were recorded. Part of the primary key.
+    - variant (str): The type of jump performed, either 'MAX' or 'CMJ'. Part of the primary key.
+    - max_height (float): The highest jump of the day.
+    - sum_height (float): The sum of all jump heights of the day.
+    - count (int): The number of jumps recorded on the day.
+    - last_timestamp (datetime): The date and time of the latest jump of the day.
+    """
+    user_id = db.Column(db.Integer,
+        db.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True
+    )
+    day = db.Column(db.Date, primary_key=True)
+    variant = db.Column(db.String(3), primary_key=True)
+    max_height = db.Column(db.Float, nullable=False)
+    sum_height = db.Column(db.Float, nullable=False)
+    count = db.Column(db.Integer, nullable=False)
+    last_timestamp = db.Column(db.DateTime, nullable=False)
@@ -17,30 +17,42 @@ Dependencies:
 - Flask: For creating the web application and handling HTTP requests.
 - Flask-JWT-Extended: For handling JSON Web Tokens (JWT) for authentication.
 - SQLAlchemy: For database interactions.
-- Bcrypt: For password hashing.
 
 Authors:
 - John Zhang
 """
 
-import io
-from datetime import timedelta
-from flask import jsonify, request, Response
+import hashlib
+from types import MappingProxyType
+from datetime import datetime, timezone
+from flask import jsonify, request, Response, stream_with_context
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
-from sqlalchemy import desc, func
-import bcrypt
-from models import User, VerticalJumpRecord
+from sqlalchemy import func, tuple_
+from models import User, VerticalJumpRecord, DailyJumpSummary
 import utils
 
+IMAGE_MIMETYPES = MappingProxyType({'png': 'image/png', 'svg': 'image/svg+xml'})
 
-def create_routes(app, db):
+
+def create_routes(app, db, cache):
     """
     Sets up the API routes for the application.
 
     Parameters:
     - app (Flask): The Flask application.
     - db (SQLAlchemy): An instance of the SQLAlchemy class.
+    - cache (Cache): An instance of the Flask-Caching Cache class.
+
+    Password hashing and verification are dispatched to the thread pool
+    registered under app.extensions['bcrypt_pool'], and plots are rendered
+    in the process pool registered under app.extensions['plot_pool'].
     """
+    bcrypt_cost = app.config.get('BCRYPT_COST', 12)
+    bcrypt_pool = app.extensions['bcrypt_pool']
+    # Unknown usernames are checked against this hash, so that they take as
+    # long to reject as wrong passwords.
+    dummy_hash = utils.hash_password(b'dummy password', bcrypt_cost)
+    plot_pool = app.extensions['plot_pool']
 
     @app.post('/api/register')
     def register():
@@ -49,18 +61,21 @@ def create_routes(app, db):
 
         See README.md for a detailed documentation.
         """
-        username = request.json.get('username', None)
-        password = request.json.get('password', None)
-        tip_toe_height = request.json.get('tip-toe', None)
+        data = utils.get_json_object(request)
+        username = data.get('username', None)
+        password = data.get('password', None)
+        tip_toe_height = data.get('tip-toe', None)
 
         validation_error = utils.validate_register(username, password, tip_toe_height)
 
         if validation_error:
             return jsonify(validation_error), 400
 
+        password = password.encode()
+
         db.session.add(User(
             username=username,
-            password=bcrypt.hashpw(password.encode(), bcrypt.gensalt()),
+            password=bcrypt_pool.submit(utils.hash_password, password, bcrypt_cost).result(),
             tip_toe_height=tip_toe_height
         ))
         db.session.commit()
@@ -73,15 +88,31 @@ def create_routes(app, db):
         
         See README.md for a detailed documentation.
         """
-        username = request.json.get('username')
-        password = request.json.get('password')
+        data = utils.get_json_object(request)
+        username = data.get('username')
+        password = data.get('password')
+
+        validation_error = utils.validate_login(username, password)
+        if validation_error:
+            return jsonify(validation_error), 400
+
+        # bcrypt only uses the first 72 bytes; longer passwords registered
+        # before the 72-byte limit was enforced were hashed truncated.
+        password = password.encode()[:72]
 
         user = User.query.filter_by(username=username).one_or_none()
 
-        if user is None or not bcrypt.checkpw(password.encode(), user.password):
+        hashed = user.password if user is not None else dummy_hash
+        password_matches = bcrypt_pool.submit(utils.verify_password, password, hashed).result()
+
+        if user is None or not password_matches:
             return jsonify({'msg': 'incorrect username or password'}), 401
-        else:
-            return jsonify({'access_token': create_access_token(identity=user.id)}), 200
+
+        if utils.needs_rehash(user.password, bcrypt_cost):
+            user.password = bcrypt_pool.submit(utils.hash_password, password, bcrypt_cost).result()
+            db.session.commit()
+
+        return jsonify({'access_token': create_access_token(identity=user.id)}), 200
 
     @app.post('/api/record-jump')
     @jwt_required()
@@ -91,12 +122,15 @@ def create_routes(app, db):
         
         See README.md for a detailed documentation.
         """
-        user = User.query.filter_by(id=get_jwt_identity()).one_or_404()
+        user = User.query.with_entities(
+            User.id, User.tip_toe_height
+        ).filter_by(id=get_jwt_identity()).one_or_404()
 
-        variant = request.json.get('variant')
-        time = request.json.get('hang-time')
-        body_weight = request.json.get('body-weight')
-        note = request.json.get('note')
+        data = utils.get_json_object(request)
+        variant = data.get('variant')
+        time = data.get('hang-time')
+        body_weight = data.get('body-weight')
+        note = data.get('note')
 
         validation_error = utils.validate_record_jump(variant, time, body_weight, note)
         if validation_error:
@@ -104,13 +138,13 @@ def create_routes(app, db):
 
         height = 9.80665 / 8 * time ** 2 + user.tip_toe_height
 
-        db.session.add(VerticalJumpRecord(
-            variant=variant,
-            height=height,
-            weight=body_weight,
-            note=note,
-            user_id=user.id
-        ))
+        utils.insert_jumps(db, [{
+            'variant': variant,
+            'height': height,
+            'weight': body_weight,
+            'note': note,
+            'user_id': user.id
+        }])
         db.session.commit()
 
         return jsonify({'msg': 'jump recorded successfully'}), 200
@@ -125,12 +159,16 @@ def create_routes(app, db):
         """
         user_id = get_jwt_identity()
 
-        variant = request.args.get('variant', None)
-        aggregation = request.args.get('aggregation', None)
-        height_unit = request.args.get('height-unit', 'm')
-        weight_unit = request.args.get('weight-unit', 'kg')
-        utc_offset = request.args.get('utc-offset', '0')
-        order = request.args.get('order-by', 'date')
+        args = request.args
+        variant = args.get('variant', None)
+        aggregation = args.get('aggregation', None)
+        height_unit = args.get('height-unit', 'm')
+        weight_unit = args.get('weight-unit', 'kg')
+        utc_offset = args.get('utc-offset', '0')
+        order = args.get('order-by', 'date')
+        limit = args.get('limit', None)
+        after_ts = args.get('after-ts', None)
+        after_id = args.get('after-id', None)
 
         validation_error = utils.validate_query_params(
             variant,
@@ -140,30 +178,53 @@ def create_routes(app, db):
             utc_offset,
             order,
             None
-        )
+        ) or utils.validate_pagination_params(limit, after_ts, after_id, order, aggregation)
         if validation_error:
             return jsonify(validation_error), 400
-        
+
         jumps = utils.build_and_filter_query(db, user_id, order, variant, aggregation)
 
-        height_conversion = {'m': 1,  'cm': 100, 'in': 39.3701}
-        weight_conversion = {'kg': 1, 'lbs': 2.20462}
-        height_conversion_factor = height_conversion[height_unit]
-        weight_conversion_factor = weight_conversion[weight_unit]
+        height_conversion_factor = utils.HEIGHT_CONVERSION[height_unit]
+        weight_conversion_factor = utils.WEIGHT_CONVERSION[weight_unit]
         utc_offset = int(utc_offset)
-            
-        result = []
-        for jump in jumps:
-            item = {
-                'date': (jump.date + timedelta(hours=utc_offset)).strftime('%a %d %b %Y'),
-                'height': jump.height * height_conversion_factor,
-                'variant': jump.variant,
-                'weight': jump.weight * weight_conversion_factor,
-                'note': jump.note
-            }
-            result.append(item)
 
-        return jsonify(result), 200
+        if limit is not None:
+            limit = int(limit)
+
+            if after_ts is not None:
+                after_ts = datetime.fromisoformat(after_ts)
+                if after_ts.tzinfo is not None:
+                    after_ts = after_ts.astimezone(timezone.utc).replace(tzinfo=None)
+                jumps = jumps.filter(
+                    tuple_(VerticalJumpRecord.timestamp, VerticalJumpRecord.id) > (after_ts, int(after_id))
+                )
+
+            rows = jumps.limit(limit).all()
+            next_page = None
+            if len(rows) == limit:
+                # A naive UTC ISO string has no '+', so it can be pasted into a URL as is.
+                next_page = {'after-ts': rows[-1].date.isoformat(), 'after-id': rows[-1].id}
+
+            return jsonify({
+                'items': utils.format_jumps(
+                    rows,
+                    height_conversion_factor,
+                    weight_conversion_factor,
+                    utc_offset
+                ),
+                'next': next_page
+            }), 200
+
+        return Response(
+            stream_with_context(utils.stream_jumps(
+                db,
+                jumps,
+                height_conversion_factor,
+                weight_conversion_factor,
+                utc_offset
+            )),
+            mimetype='application/json'
+        ), 200
 
     @app.get('/api/plot')
     @jwt_required()
@@ -175,33 +236,65 @@ def create_routes(app, db):
         """
         user_id = get_jwt_identity()
 
-        timespan = request.args.get('years', '1')
-        utc_offset = request.args.get('utc-offset', '0')
-        variant = request.args.get('variant', 'MAX')
-        aggregation = request.args.get('aggregation', 'max')
-        height_unit = request.args.get('height-unit', 'm')
-        
+        args = request.args
+        timespan = args.get('years', '1')
+        utc_offset = args.get('utc-offset', '0')
+        variant = args.get('variant', 'MAX')
+        aggregation = args.get('aggregation', 'max')
+        height_unit = args.get('height-unit', 'm')
+        image_format = args.get('format', 'png')
+
         validation_error = utils.validate_query_params(variant, aggregation, height_unit, 'kg', utc_offset, 'date', timespan)
         if validation_error:
             return jsonify(validation_error), 400
 
+        mimetype = IMAGE_MIMETYPES.get(image_format)
+        if mimetype is None:
+            return jsonify({'msg': "format must be either 'png' or 'svg'"}), 400
+
         timespan = int(timespan)
         utc_offset = int(utc_offset)
 
-        jumps = utils.build_and_filter_query(db, user_id, 'date', variant, aggregation)
+        # The key, and with it the ETag, is derived from the stored jump records,
+        # so every worker agrees on it. The plot window ends at the current date,
+        # so plots are also keyed by day.
+        cache_key = (
+            f'plot:{user_id}:{utils.get_data_version(db, user_id)}:{utils.utc_now().date()}:'
+            f'{variant}:{aggregation}:{height_unit}:{timespan}:{utc_offset}:{image_format}'
+        )
+        etag = hashlib.sha1(cache_key.encode()).hexdigest()
+        if request.if_none_match.contains(etag):
+            return utils.set_revalidation_headers(Response(status=304), etag)
 
-        height_conversion = {'m': 1,  'cm': 100, 'in': 39.3701}
+        image = cache.get(cache_key)
+        if image is not None:
+            return utils.set_revalidation_headers(Response(image, mimetype=mimetype), etag)
 
-        buf = io.BytesIO()
-        utils.generate_plot(
-            buf,
-            [(jump.date + timedelta(hours=utc_offset)).date() for jump in jumps],
-            [jump.height * height_conversion[height_unit] for jump in jumps],
+        if aggregation == 'max':
+            height = DailyJumpSummary.max_height
+        else:
+            height = DailyJumpSummary.sum_height / DailyJumpSummary.count
+
+        jumps = db.session.query(
+            DailyJumpSummary.last_timestamp.label('date'),
+            height.label('height')
+        ).filter(
+            DailyJumpSummary.user_id == user_id,
+            DailyJumpSummary.variant == variant
+        ).order_by(DailyJumpSummary.day).all()
+
+        image = plot_pool.submit(
+            utils.render_plot,
+            [tuple(jump) for jump in jumps],
+            utils.HEIGHT_CONVERSION[height_unit],
+            utc_offset,
             height_unit,
-            timespan
-        )
+            timespan,
+            image_format
+        ).result()
+        cache.set(cache_key, image)
 
-        return Response(buf, mimetype='image/png')
+        return utils.set_revalidation_headers(Response(image, mimetype=mimetype), etag)
 
     @app.get('/api/summary')
     @jwt_required()
@@ -214,34 +307,43 @@ def create_routes(app, db):
         user_id = get_jwt_identity()
         height_unit = request.args.get('height-unit', 'm')
 
-        jumps = utils.build_and_filter_query(db, user_id, 'date', None, None)
-        num_jumps = len(jumps.all())
-        num_days = len({jump.date.date() for jump in jumps})
-
-        highest_jump = utils.build_and_filter_query(db, user_id, 'height', None, None).all()[-1]
-        last_jump = utils.build_and_filter_query(db, user_id, 'date', None, 'max').all()[-1]
-
-        height_conversion = {'m': 1,  'cm': 100, 'in': 39.3701}
-        if height_unit not in height_conversion:
+        conversion_factor = utils.HEIGHT_CONVERSION.get(height_unit)
+        if conversion_factor is None:
             return jsonify({"msg": "height-unit must be either 'm', 'cm', or 'in'"}), 400
-        else:
-            conversion_factor = height_conversion[height_unit]
-
-        return jsonify(
-            {
-                'num-records': num_jumps,
-                'num-days': num_days,
-                'highest-jump': {
-                    'height': highest_jump[1] * conversion_factor,
-                    'date': highest_jump[0].date()
-                },
-                'last-jump': {
-                    'height': last_jump[1] * conversion_factor,'date': last_jump[0].date()
-                },
-                'improvement': {
-                    '6-months': utils.get_improvement(db, user_id, 6, conversion_factor),
-                    '12-months': utils.get_improvement(db, user_id, 12, conversion_factor),
-                    '24-months': utils.get_improvement(db, user_id, 24, conversion_factor)
-                }
+
+        cache_key = f'summary:{user_id}:{utils.get_data_version(db, user_id)}:{height_unit}'
+        summary = cache.get(cache_key)
+        if summary is not None:
+            return jsonify(summary), 200
+
+        daily_jumps = db.session.query(
+            DailyJumpSummary.day,
+            func.max(DailyJumpSummary.max_height).label('max_height'),
+            func.sum(DailyJumpSummary.count).label('count')
+        ).filter(
+            DailyJumpSummary.user_id == user_id
+        ).group_by(DailyJumpSummary.day).order_by(DailyJumpSummary.day).all()
+
+        summary = {
+            'num-records': sum(jump.count for jump in daily_jumps),
+            'num-days': len(daily_jumps),
+            'highest-jump': None,
+            'last-jump': None,
+            'improvement': utils.get_improvements(daily_jumps, [6, 12, 24], conversion_factor)
+        }
+
+        if daily_jumps:
+            highest_jump = max(daily_jumps, key=lambda jump: jump.max_height)
+            last_jump = daily_jumps[-1]
+            summary['highest-jump'] = {
+                'height': highest_jump.max_height * conversion_factor,
+                'date': highest_jump.day
             }
-        ), 200
+            summary['last-jump'] = {
+                'height': last_jump.max_height * conversion_factor,
+                'date': last_jump.day
+            }
+
+        cache.set(cache_key, summary)
+
+        return jsonify(summary), 200
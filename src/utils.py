@@ -1,37 +1,213 @@
 """
 This module provides utility functions for the routes.py module.
 
+Constants:
+- HEIGHT_CONVERSION: Conversion factors from meters to each supported height unit.
+- WEIGHT_CONVERSION: Conversion factors from kilograms to each supported weight unit.
+- VARIANTS, AGGREGATIONS, ORDERS, UTC_OFFSETS: Accepted values of the validated request parameters.
+- SUMMARY_UPSERTS: The dialects whose daily jump summaries are written with a single upsert.
+
 Utilities:
+- utc_now(): Returns the current date and time in UTC.
+- ORJSONProvider: A Flask JSON provider backed by orjson.
+- hash_password(password, rounds):
+    Hashes a password with bcrypt using the given cost factor.
+- verify_password(password, hashed):
+    Checks a password against a bcrypt hash.
+- needs_rehash(hashed, rounds):
+    Checks whether a bcrypt hash was generated with a different cost factor.
+- get_json_object(request): Returns the JSON object in the body of a request.
 - validate_register(username, password, tip_toe_height):
     Validates user registration input.
+- validate_login(username, password):
+    Validates user login input.
 - validate_record_jump(variant, time, body_weight, note):
     Validates jump record input.
-- get_improvement(user_id, timespan): Calculates improvement in jump height
-    over a specified timespan.
+- get_improvements(jumps, timespans, conversion_factor): Calculates improvement in jump height
+    over each of the specified timespans.
 - validate_query_params(variant, aggregation, height_unit, weight_unit, utc_offset, order, timespan):
     Validates query parameters.
+- validate_pagination_params(limit, after_ts, after_id, order, aggregation):
+    Validates pagination query parameters.
 - build_and_filter_query(db, user_id, order, variant, aggregation):
     Builds and filters query based on given parameters.
-- generate_plot(buf, x, y, height_unit, timespan):
-    Generates a plot based on the given parameters and saves a png image to buffer.
+- get_data_version(db, user_id):
+    Returns the version that cache keys of the user's responses are tagged with.
+- set_revalidation_headers(response, etag):
+    Lets clients cache a response as long as they revalidate it with its ETag.
+- insert_jumps(db, jumps):
+    Inserts jump records in bulk and adds them to their users' daily jump summaries.
+- merge_summaries(db, summaries):
+    Adds daily jump summaries to the stored ones without a dialect-specific upsert.
+- format_jumps(jumps, height_conversion_factor, weight_conversion_factor, utc_offset):
+    Converts queried jump records into JSON-serializable dictionaries.
+- stream_jumps(db, jumps, height_conversion_factor, weight_conversion_factor, utc_offset, batch_size):
+    Serializes queried jump records as a JSON array, one batch at a time.
+- render_plot(jumps, height_conversion_factor, utc_offset, height_unit, timespan, image_format):
+    Renders a plot and returns the image, for use from a worker process.
+- generate_plot(buf, jumps, height_conversion_factor, utc_offset, height_unit, timespan, image_format):
+    Generates a plot based on the given parameters and saves a png or svg image to buffer.
 
 Dependencies:
 - SQLAlchemy: For database interactions.
+- Bcrypt: For password hashing.
+- NumPy: For vectorized conversion of query results.
+- orjson: For JSON serialization.
 - Matplotlib: For generating plots.
 
 Authors:
 - John Zhang
 """
 
+import bisect
+import io
+import threading
+from types import MappingProxyType
 from datetime import datetime, timezone, timedelta
+from flask.json.provider import JSONProvider
 import matplotlib.dates as mdates
-import matplotlib
-from matplotlib import pyplot as plt
-from sqlalchemy import func
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+import numpy as np
+import orjson
+from sqlalchemy import func, insert
+from sqlalchemy.dialects import postgresql, sqlite
+import bcrypt
+
+from models import VerticalJumpRecord, DailyJumpSummary
+
+# Conversion factors from meters and kilograms, keyed by the accepted unit names.
+HEIGHT_CONVERSION = MappingProxyType({'m': 1.0, 'cm': 100.0, 'in': 39.3701})
+WEIGHT_CONVERSION = MappingProxyType({'kg': 1.0, 'lbs': 2.20462})
+
+# Accepted values of the validated request parameters.
+VARIANTS = frozenset({'MAX', 'CMJ'})
+AGGREGATIONS = frozenset({'max', 'avg', None})
+ORDERS = frozenset({'date', 'weight', 'height'})
+UTC_OFFSETS = frozenset(str(n) for n in range(-12, 15))
+
+# Summary upserts by dialect name: the INSERT construct with ON CONFLICT support,
+# and the function that returns the larger of two values.
+SUMMARY_UPSERTS = MappingProxyType({
+    'sqlite': (sqlite.insert, func.max),
+    'postgresql': (postgresql.insert, func.greatest)
+})
+
+# Each thread keeps one figure that is cleared and redrawn for every plot.
+_plot_state = threading.local()
+
+
+def utc_now():
+    """
+    Returns the current date and time in UTC.
+
+    All "now" lookups go through this function so that they agree on the
+    timezone of the stored timestamps and can be replaced in one place.
+
+    Returns:
+    - datetime: The current timezone-aware UTC date and time.
+    """
+    return datetime.now(timezone.utc)
+
+
+class ORJSONProvider(JSONProvider):
+    """
+    A Flask JSON provider that serializes and deserializes with orjson.
+
+    Dates and datetimes are serialized as ISO 8601 strings, naive datetimes
+    are treated as UTC, and NumPy arrays and scalars are serialized natively.
+    """
+
+    def dumps(self, obj, **kwargs):
+        """
+        Serializes obj to a JSON string.
+
+        Parameters:
+        - obj (Any): The object to serialize.
+
+        Returns:
+        - str: The JSON document.
+        """
+        return orjson.dumps(
+            obj,
+            option=orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY
+        ).decode()
+
+    def loads(self, s, **kwargs):
+        """
+        Deserializes a JSON document.
+
+        Parameters:
+        - s (str | bytes): The JSON document.
+
+        Returns:
+        - Any: The deserialized object.
+        """
+        return orjson.loads(s)
+
+
+def hash_password(password, rounds):
+    """
+    Hashes a password with bcrypt using the given cost factor.
+
+    All password hashing goes through this function so that the algorithm
+    and its parameters can be changed in a single place.
+
+    Parameters:
+    - password (bytes): The UTF-8 encoded plaintext password. Must be at most 72 bytes long.
+    - rounds (int): The bcrypt cost factor. Hashing time grows with 2^rounds.
+
+    Returns:
+    - bytes: The bcrypt hash of the password.
+    """
+    return bcrypt.hashpw(password, bcrypt.gensalt(rounds=rounds))
+
+
+def verify_password(password, hashed):
+    """
+    Checks a password against a bcrypt hash.
+
+    Parameters:
+    - password (bytes): The UTF-8 encoded plaintext password. Must be at most 72 bytes long.
+    - hashed (bytes): The stored bcrypt hash.
+
+    Returns:
+    - bool: True if the password matches the hash, False otherwise.
+    """
+    return bcrypt.checkpw(password, hashed)
+
+
+def needs_rehash(hashed, rounds):
+    """
+    Checks whether a bcrypt hash was generated with a different cost factor.
+
+    Parameters:
+    - hashed (bytes): The stored bcrypt hash, in the form b'$2b$<cost>$<salt+digest>'.
+    - rounds (int): The currently configured bcrypt cost factor.
+
+    Returns:
+    - bool: True if the hash should be regenerated with the configured cost factor.
+    """
+    return int(hashed.split(b'$')[2]) != rounds
+
+
+def get_json_object(request):
+    """
+    Returns the JSON object in the body of a request.
 
-from models import VerticalJumpRecord
+    Missing or malformed bodies and JSON values other than objects yield an
+    empty dictionary, so that the validators report the missing fields.
 
-matplotlib.use('Agg')
+    Parameters:
+    - request (Request): The Flask request.
+
+    Returns:
+    - dict[str, Any]: The parsed JSON object, or an empty dictionary.
+    """
+    data = request.get_json(silent=True)
+    return data if isinstance(data, dict) else {}
 
 
 def validate_register(username, password, tip_toe_height):
@@ -52,11 +228,33 @@ def validate_register(username, password, tip_toe_height):
         return {'msg': 'username must be a string from 1 to 20 characters long'}
     if not isinstance(password, str) or not 10 <= len(password) <= 80:
         return {'msg': 'password must be a string from 10 to 80 characters long'}
+    if len(password.encode()) > 72:
+        return {'msg': 'password must not exceed 72 bytes when UTF-8 encoded'}
     if not isinstance(tip_toe_height, float) or not tip_toe_height > 0:
         return {'msg': 'tip-toe must be a positive floating point value'}
     return None
 
 
+def validate_login(username, password):
+    """
+    Validates user input to the login() function.
+
+    Parameters:
+    - username (Any): The user input for username.
+    - password (Any): The user input for password.
+
+    Returns:
+    - Optional[dict[str, str]]: 
+        - A dictionary with a single key 'msg' and the error description.
+        - None if there are no errors with user input.
+    """
+    if not isinstance(username, str):
+        return {'msg': 'username must be a string'}
+    if not isinstance(password, str) or len(password) > 1024:
+        return {'msg': 'password must be a string of at most 1024 characters'}
+    return None
+
+
 def validate_record_jump(variant, time, body_weight, note):
     """
     Validates user input to the record_jump() function.
@@ -72,7 +270,7 @@ def validate_record_jump(variant, time, body_weight, note):
         - A dictionary with a single key 'msg' and the error description.
         - None if there are no errors with user input.
     """
-    if variant not in {'MAX', 'CMJ'}:
+    if variant not in VARIANTS:
         return {
             'msg': (
                 "variant must be either 'MAX' (maximum approach jump) "
@@ -86,47 +284,40 @@ def validate_record_jump(variant, time, body_weight, note):
     if note is not None and not isinstance(note, str):
         return {'msg': 'note must be a string'}
     return None
-    
-def get_improvement(db, user_id, timespan, conversion_factor):
+
+
+def get_improvements(jumps, timespans, conversion_factor):
     """
-    Calculates improvement in jump height over a specified timespan.
+    Calculates improvement in jump height over each of the specified timespans.
 
     Parameters:
-    - db (SQLAlchemy): An instance of the SQLAlchemy class.
-    - user_id (int): The id of the user to generate the summary for.
-        Must be an existing user id.
-    - timespan (int): The timespan (in months) over which the summary is generated.
-        Must be a positive integer.
+    - jumps (list): The user's daily maximum jumps as (day, height, ...) rows ordered by day.
+    - timespans (list[int]): The timespans (in months) over which the improvements are calculated.
+        Must be positive integers.
     - conversion_factor (float): The conversion factor from meters
         to the desired unit of measurement.
 
     Returns:
-    - float: the difference between the most recent jump
-        and the earliest jump in the specified timespan.
+    - dict[str, Optional[float]]: The difference between the most recent jump and the last jump
+        before each timespan (or the earliest jump, if there is none), keyed by '<timespan>-months'.
+        None for timespans without any jumps, or if there are fewer than two jumps.
     """
-    jumps = build_and_filter_query(db, user_id, 'date', None, 'max').all()
-
-    if len(jumps) <= 1:
-        return None
-
-    prev_index = 0
+    days = [jump[0] for jump in jumps]
+    now = utc_now()
+    improvements = {}
 
-    for i in range(len(jumps)):
-        if jumps[i][0] > datetime.now() - timedelta(days = timespan * 31) and i > 0:
-            prev_index = i - 1
-            break
-        elif jumps[i][0] > datetime.now() - timedelta(days = timespan * 31) and i == 0:
-            break
-        elif i == len(jumps) - 1:
-            return None
+    for timespan in timespans:
+        cutoff = (now - timedelta(days=timespan * 31)).date()
+        index = bisect.bisect_right(days, cutoff)
 
-    prev = jumps[prev_index][1]
-    now = jumps[len(jumps) - 1][1]
+        if len(jumps) <= 1 or index == len(jumps):
+            improvements[f'{timespan}-months'] = None
+        else:
+            prev = jumps[max(index - 1, 0)][1]
+            latest = jumps[-1][1]
+            improvements[f'{timespan}-months'] = (latest - prev) * conversion_factor
 
-    print(prev)
-    print(now)
-
-    return (now - prev) * conversion_factor
+    return improvements
 
 
 def validate_query_params(variant, aggregation, height_unit, weight_unit, utc_offset, order, timespan):
@@ -149,23 +340,59 @@ def validate_query_params(variant, aggregation, height_unit, weight_unit, utc_of
     """
     if aggregation == 'avg' and variant is None:
         return {'msg': "variant must be specified when using the 'avg' aggregation"}
-    if aggregation not in {'max', 'avg', None}:
+    if aggregation not in AGGREGATIONS:
         return {
             'msg': "aggregation must be either 'max' (maximum) or 'avg' (average)"
         }
-    if order not in {'date', 'weight', 'height'}:
+    if order not in ORDERS:
         return {'msg': "order-by must be either 'date', 'weight', or 'height'"}
-    if height_unit not in {'m', 'cm', 'in'}:
+    if height_unit not in HEIGHT_CONVERSION:
         return {"msg": "height-unit must be either 'm', 'cm', or 'in'"}
-    if weight_unit not in {'kg', 'lbs'}:
+    if weight_unit not in WEIGHT_CONVERSION:
         return {"msg": "weight-unit must be either 'kg' or 'lbs'"}
-    if utc_offset not in {str(n) for n in range(-12, 15)}:
+    if utc_offset not in UTC_OFFSETS:
         return {'msg': 'utc-offset must be an integer from -12 to 14'}
     if timespan is not None and (not timespan.isdigit() or timespan == '0'):
         return {'msg': 'years must be a positive integer'}
     return None
 
 
+def validate_pagination_params(limit, after_ts, after_id, order, aggregation):
+    """
+    Validates pagination query parameters.
+
+    Parameters:
+    - limit (Any): The user input for limit.
+    - after_ts (Any): The user input for after-ts.
+    - after_id (Any): The user input for after-id.
+    - order (str): The validated order-by query parameter.
+    - aggregation (Optional[str]): The validated aggregation query parameter.
+
+    Returns:
+    - Optional[dict[str, str]]:
+        - A dictionary with a single key 'msg' and the error description.
+        - None if there are no errors with user input.
+    """
+    if limit is None:
+        if after_ts is not None or after_id is not None:
+            return {'msg': 'limit must be specified when using after-ts and after-id'}
+        return None
+    if not limit.isdecimal() or not 1 <= int(limit) <= 1000:
+        return {'msg': 'limit must be an integer from 1 to 1000'}
+    if order != 'date' or aggregation is not None:
+        return {'msg': "limit can only be used with the 'date' order-by and without aggregation"}
+    if (after_ts is None) != (after_id is None):
+        return {'msg': 'after-ts and after-id must be specified together'}
+    if after_id is not None and not after_id.isdecimal():
+        return {'msg': 'after-id must be a non-negative integer'}
+    if after_ts is not None:
+        try:
+            datetime.fromisoformat(after_ts)
+        except ValueError:
+            return {'msg': 'after-ts must be an ISO 8601 date and time'}
+    return None
+
+
 def build_and_filter_query(db, user_id, order, variant, aggregation):
     """
     Builds and filters query based on given parameters.
@@ -191,11 +418,10 @@ def build_and_filter_query(db, user_id, order, variant, aggregation):
     if aggregation_func:
         jumps = db.session.query(
             VerticalJumpRecord.timestamp.label('date'),
-            VerticalJumpRecord.height.label('height'),
+            aggregation_func(VerticalJumpRecord.height).label('height'),
             VerticalJumpRecord.variant.label('variant'),
             VerticalJumpRecord.weight.label('weight'),
-            VerticalJumpRecord.note.label('note'),
-            aggregation_func(VerticalJumpRecord.height).label('height')
+            VerticalJumpRecord.note.label('note')
         ).group_by(func.date(VerticalJumpRecord.timestamp))
     else:
         jumps = db.session.query(
@@ -204,6 +430,7 @@ def build_and_filter_query(db, user_id, order, variant, aggregation):
             VerticalJumpRecord.variant.label('variant'),
             VerticalJumpRecord.weight.label('weight'),
             VerticalJumpRecord.note.label('note'),
+            VerticalJumpRecord.id.label('id')
         )
 
     jumps = jumps.filter(VerticalJumpRecord.user_id == user_id)
@@ -212,7 +439,7 @@ def build_and_filter_query(db, user_id, order, variant, aggregation):
         jumps = jumps.filter(VerticalJumpRecord.variant == variant)
 
     if order == 'date':
-        jumps = jumps.order_by(VerticalJumpRecord.timestamp)
+        jumps = jumps.order_by(VerticalJumpRecord.timestamp, VerticalJumpRecord.id)
     elif order == 'weight':
         jumps = jumps.order_by(VerticalJumpRecord.weight)
     else:
@@ -221,27 +448,296 @@ def build_and_filter_query(db, user_id, order, variant, aggregation):
     return jumps
 
 
-def generate_plot(buf, x, y, height_unit, timespan):
+def get_data_version(db, user_id):
+    """
+    Returns the version that cache keys of the user's responses are tagged with.
+
+    The version is derived from the user's daily jump summaries: their total
+    record count and latest timestamp. Jump records are only ever added, so
+    every write yields a new version, and every worker process computes the
+    same version regardless of the cache backend.
+
+    Parameters:
+    - db (SQLAlchemy): An instance of the SQLAlchemy class.
+    - user_id (int): The id of the user.
+
+    Returns:
+    - str: The current data version of the user.
+    """
+    total, last_timestamp = db.session.query(
+        func.coalesce(func.sum(DailyJumpSummary.count), 0),
+        func.max(DailyJumpSummary.last_timestamp)
+    ).filter(DailyJumpSummary.user_id == user_id).one()
+    return f'{total}-{last_timestamp}'
+
+
+def set_revalidation_headers(response, etag):
+    """
+    Lets clients cache a response as long as they revalidate it with its ETag.
+
+    Clients that send the ETag back in If-None-Match can be answered with an
+    empty 304 response instead of the full body.
+
+    Parameters:
+    - response (Response): The response to add the headers to.
+    - etag (str): The ETag identifying the content of the response.
+
+    Returns:
+    - Response: The same response, with the ETag and Cache-Control headers set.
+    """
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+
+def insert_jumps(db, jumps):
+    """
+    Inserts jump records in bulk and adds them to their users' daily jump summaries.
+
+    The records are written with a single executemany INSERT. On the dialects in
+    SUMMARY_UPSERTS, the matching DailyJumpSummary rows are created or updated
+    with a single executemany INSERT ... ON CONFLICT DO UPDATE. Other databases
+    fall back to locking and updating each affected summary row, or inserting
+    it if it does not exist yet. The changes are added to the current session
+    and are not committed.
+
+    Parameters:
+    - db (SQLAlchemy): An instance of the SQLAlchemy class.
+    - jumps (list[dict[str, Any]]): The jump records to insert. Each dictionary holds
+        the VerticalJumpRecord columns 'user_id', 'variant', 'height', 'weight', and 'note',
+        and optionally 'timestamp' (UTC), which defaults to the current time.
+
+    Returns:
+    - None
+    """
+    now = utc_now()
+    jumps = [{'timestamp': now, **jump} for jump in jumps]
+    summaries = [
+        {
+            'user_id': jump['user_id'],
+            'day': jump['timestamp'].date(),
+            'variant': jump['variant'],
+            'max_height': jump['height'],
+            'sum_height': jump['height'],
+            'count': 1,
+            'last_timestamp': jump['timestamp']
+        }
+        for jump in jumps
+    ]
+
+    with db.session.no_autoflush:
+        db.session.execute(insert(VerticalJumpRecord), jumps)
+
+        upsert = SUMMARY_UPSERTS.get(db.session.get_bind().dialect.name)
+        if upsert is None:
+            merge_summaries(db, summaries)
+            return
+
+        upsert, greatest = upsert
+        summary_statement = upsert(DailyJumpSummary)
+        summary_statement = summary_statement.on_conflict_do_update(
+            index_elements=['user_id', 'day', 'variant'],
+            set_={
+                'max_height': greatest(DailyJumpSummary.max_height, summary_statement.excluded.max_height),
+                'sum_height': DailyJumpSummary.sum_height + summary_statement.excluded.sum_height,
+                'count': DailyJumpSummary.count + summary_statement.excluded.count,
+                'last_timestamp': greatest(DailyJumpSummary.last_timestamp, summary_statement.excluded.last_timestamp)
+            }
+        )
+        db.session.execute(summary_statement, summaries)
+
+
+def merge_summaries(db, summaries):
+    """
+    Adds daily jump summaries to the stored ones without a dialect-specific upsert.
+
+    Summaries that share a key are combined first. Each stored row is then read
+    with SELECT ... FOR UPDATE, so concurrent writers to the same day wait for
+    each other, and updated, or inserted if the day has no row yet.
+
+    Parameters:
+    - db (SQLAlchemy): An instance of the SQLAlchemy class.
+    - summaries (list[dict[str, Any]]): DailyJumpSummary column values, one per jump.
+
+    Returns:
+    - None
+    """
+    merged = {}
+    for summary in summaries:
+        # Stored timestamps are naive UTC, and are compared with the new ones.
+        timestamp = summary['last_timestamp']
+        if timestamp.tzinfo is not None:
+            summary = {**summary, 'last_timestamp': timestamp.astimezone(timezone.utc).replace(tzinfo=None)}
+
+        key = (summary['user_id'], summary['day'], summary['variant'])
+        if key not in merged:
+            merged[key] = dict(summary)
+            continue
+        total = merged[key]
+        total['max_height'] = max(total['max_height'], summary['max_height'])
+        total['sum_height'] += summary['sum_height']
+        total['count'] += summary['count']
+        total['last_timestamp'] = max(total['last_timestamp'], summary['last_timestamp'])
+
+    for key, summary in merged.items():
+        stored = db.session.get(DailyJumpSummary, key, with_for_update=True)
+        if stored is None:
+            db.session.add(DailyJumpSummary(**summary))
+            continue
+        stored.max_height = max(stored.max_height, summary['max_height'])
+        stored.sum_height += summary['sum_height']
+        stored.count += summary['count']
+        stored.last_timestamp = max(stored.last_timestamp, summary['last_timestamp'])
+
+
+def format_jumps(jumps, height_conversion_factor, weight_conversion_factor, utc_offset):
+    """
+    Converts queried jump records into JSON-serializable dictionaries.
+
+    Unit conversions and the timezone shift are applied column-wise with NumPy,
+    and each distinct calendar day is formatted only once.
+
+    Parameters:
+    - jumps (list): Rows returned by a query from build_and_filter_query(), whose first
+        five columns are date, height, variant, weight, and note.
+    - height_conversion_factor (float): The conversion factor from meters
+        to the desired unit of measurement for jump height.
+    - weight_conversion_factor (float): The conversion factor from kilograms
+        to the desired unit of measurement for body weight.
+    - utc_offset (int): The UTC offset hours for the user's timezone.
+
+    Returns:
+    - list[dict[str, Any]]: One dictionary per jump with the keys
+        'date', 'height', 'variant', 'weight', and 'note'.
+    """
+    if not jumps:
+        return []
+
+    dates, heights, variants, weights, notes = list(zip(*jumps))[:5]
+
+    days = (
+        np.array(dates, dtype='datetime64[us]') + np.timedelta64(utc_offset, 'h')
+    ).astype('datetime64[D]')
+    unique_days, day_indices = np.unique(days, return_inverse=True)
+    day_labels = np.array([day.strftime('%a %d %b %Y') for day in unique_days.tolist()])
+
+    heights = np.array(heights, dtype=float) * height_conversion_factor
+    weights = np.array(weights, dtype=float) * weight_conversion_factor
+
+    return [
+        {'date': date, 'height': height, 'variant': variant, 'weight': weight, 'note': note}
+        for date, height, variant, weight, note in zip(
+            day_labels[day_indices].tolist(),
+            heights.tolist(),
+            variants,
+            weights.tolist(),
+            notes
+        )
+    ]
+
+
+def stream_jumps(db, jumps, height_conversion_factor, weight_conversion_factor, utc_offset, batch_size=500):
+    """
+    Serializes queried jump records as a JSON array, one batch at a time.
+
+    Rows are fetched from the cursor batch_size at a time, so memory use stays
+    constant regardless of how many records the query returns.
+
+    Parameters:
+    - db (SQLAlchemy): An instance of the SQLAlchemy class.
+    - jumps (sqlalchemy.orm.query.Query): A query from build_and_filter_query().
+    - height_conversion_factor (float): The conversion factor from meters
+        to the desired unit of measurement for jump height.
+    - weight_conversion_factor (float): The conversion factor from kilograms
+        to the desired unit of measurement for body weight.
+    - utc_offset (int): The UTC offset hours for the user's timezone.
+    - batch_size (int): The number of rows fetched and serialized at a time.
+
+    Returns:
+    - Iterator[bytes]: Chunks of the JSON array, in the format of format_jumps().
+    """
+    rows = db.session.execute(jumps.statement.execution_options(yield_per=batch_size))
+
+    yield b'['
+    separator = b''
+    for batch in rows.partitions():
+        items = orjson.dumps(
+            format_jumps(batch, height_conversion_factor, weight_conversion_factor, utc_offset)
+        )
+        yield separator + items[1:-1]
+        separator = b','
+    yield b']'
+
+
+def render_plot(jumps, height_conversion_factor, utc_offset, height_unit, timespan, image_format='png'):
+    """
+    Renders a plot and returns the image, for use from a worker process.
+
+    The arguments and the return value are plain picklable values, so this
+    function can be submitted to a ProcessPoolExecutor.
+
+    Parameters:
+    - jumps (list[tuple]): (date, height) tuples of the daily jump records, ordered by date.
+    - height_conversion_factor (float): The conversion factor from meters
+        to the desired unit of measurement for jump height.
+    - utc_offset (int): The UTC offset hours for the user's timezone.
+    - height_unit (str): The unit of measurement for jump height.
+    - timespan (int): The timespan in years over which the jump records are plotted. Must be positive.
+    - image_format (str): The image format. Must be either 'png' or 'svg'.
+
+    Returns:
+    - bytes: The image of the plot.
     """
-    Generates a plot based on the given parameters and saves a png image to buffer.
+    buf = io.BytesIO()
+    generate_plot(buf, jumps, height_conversion_factor, utc_offset, height_unit, timespan, image_format)
+    return buf.getvalue()
+
+
+def generate_plot(buf, jumps, height_conversion_factor, utc_offset, height_unit, timespan, image_format='png'):
+    """
+    Generates a plot based on the given parameters and saves a png or svg image to buffer.
+
+    The plot is drawn on a figure that is cached per thread and reused across
+    calls, without going through pyplot's global figure registry. The line is
+    added as a single LineCollection path built from the coordinate arrays.
 
     Parameters:
-    - buf (io.BytesIO): A binary buffer which will contain the png image of the plot.
-    - x (list): x-coordinates of datapoints. Must be the same length as y.
-    - y (list): y-coordinates of datapoints. Must be the same length as x.
+    - buf (io.BytesIO): A binary buffer which will contain the image of the plot.
+    - jumps (list): (date, height) rows of the daily jump records, ordered by date.
+    - height_conversion_factor (float): The conversion factor from meters
+        to the desired unit of measurement for jump height.
+    - utc_offset (int): The UTC offset hours for the user's timezone.
     - height_unit (str): The unit of measurement for jump height.
     - timespan (int): The timespan in years over which the jump records are plotted. Must be positive.
+    - image_format (str): The image format. Must be either 'png' or 'svg'. SVG output skips rasterization.
 
     Returns:
     - None
     """
-    fig, ax = plt.subplots()
-    ax.plot(x,y)
+    if not hasattr(_plot_state, 'figure'):
+        _plot_state.figure = Figure()
+        _plot_state.canvas = FigureCanvasAgg(_plot_state.figure)
+        _plot_state.axes = _plot_state.figure.subplots()
+
+    dates, heights = zip(*jumps) if jumps else ((), ())
+    x = mdates.date2num((
+        np.array(dates, dtype='datetime64[us]') + np.timedelta64(utc_offset, 'h')
+    ).astype('datetime64[D]'))
+    y = np.array(heights, dtype=float) * height_conversion_factor
+
+    ax = _plot_state.axes
+    ax.cla()
+    line = np.column_stack([x, y])
+    ax.add_collection(LineCollection([line], colors='C0', linewidths=rcParams['lines.linewidth']))
+    ax.autoscale_view()
+    ax.xaxis_date()
     ax.set_xlabel('date')
     ax.set_ylabel(f'jump height ({height_unit})')
     ax.xaxis.set_major_locator(mdates.MonthLocator(interval=timespan * 2))
     ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y-%m'))
-    ax.set_xlim(datetime.now(timezone.utc) - timedelta(days=timespan * 365), datetime.now(timezone.utc))
+    now = utc_now()
+    ax.set_xlim(now - timedelta(days=timespan * 365), now)
 
-    fig.savefig(buf, format='png')
+    _plot_state.canvas.print_figure(buf, format=image_format)
     buf.seek(0)
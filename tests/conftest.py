@@ -0,0 +1,44 @@
+"""
+This module provides shared pytest fixtures for the VertTracker API tests.
+
+Fixtures:
+- app: A Flask application backed by an empty temporary SQLite database.
+- client: A test client for the app.
+- auth_header: An Authorization header for a freshly registered user.
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from app import create_app
+from models import db
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app({
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "test.db"}',
+        'BCRYPT_COST': 4
+    })
+    with app.app_context():
+        db.create_all()
+    yield app
+    app.extensions['plot_pool'].shutdown()
+    app.extensions['bcrypt_pool'].shutdown()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth_header(client):
+    credentials = {'username': 'test_user', 'password': '1234567890'}
+    client.post('/api/register', json={**credentials, 'tip-toe': 0.05})
+    token = client.post('/api/login', json=credentials).json['access_token']
+    return {'Authorization': f'Bearer {token}'}
@@ -0,0 +1,185 @@
+"""
+This module tests the endpoints in routes.py.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+import utils
+from app import create_app
+from models import db, DailyJumpSummary, User
+
+
+@pytest.fixture
+def other_client(app):
+    """A client of a second app on the same database, like a second server worker."""
+    other = create_app({
+        'SQLALCHEMY_DATABASE_URI': app.config['SQLALCHEMY_DATABASE_URI'],
+        'BCRYPT_COST': 4
+    })
+    yield other.test_client()
+    other.extensions['plot_pool'].shutdown()
+    other.extensions['bcrypt_pool'].shutdown()
+
+
+def record(app, jumps):
+    with app.app_context():
+        user_id = db.session.query(User.id).filter_by(username='test_user').scalar()
+        utils.insert_jumps(db, [
+            {'user_id': user_id, 'variant': variant, 'height': height,
+             'weight': 80.0, 'note': None, 'timestamp': timestamp}
+            for timestamp, variant, height in jumps
+        ])
+        db.session.commit()
+
+
+@pytest.fixture
+def jumps(app, auth_header):
+    record(app, [
+        (datetime(2024, 3, 1, 9), 'MAX', 0.50),
+        (datetime(2024, 3, 1, 12), 'MAX', 0.70),
+        (datetime(2024, 3, 1, 18), 'MAX', 0.66),
+        (datetime(2024, 3, 2, 10), 'MAX', 0.40),
+        (datetime(2024, 3, 2, 11), 'CMJ', 0.90),
+    ])
+
+
+@pytest.mark.parametrize('aggregation, expected', [
+    ('avg', [(0.50 + 0.70 + 0.66) / 3, 0.40]),
+    ('max', [0.70, 0.40]),
+])
+def test_get_jumps_aggregates_each_day(client, auth_header, jumps, aggregation, expected):
+    response = client.get(
+        f'/api/jumps?variant=MAX&aggregation={aggregation}',
+        headers=auth_header
+    )
+
+    assert response.status_code == 200
+    assert [jump['date'] for jump in response.json] == ['Fri 01 Mar 2024', 'Sat 02 Mar 2024']
+    assert [jump['height'] for jump in response.json] == pytest.approx(expected)
+
+
+def test_get_jumps_converts_units(client, auth_header, jumps):
+    response = client.get('/api/jumps?variant=CMJ&height-unit=cm&weight-unit=lbs', headers=auth_header)
+
+    assert response.status_code == 200
+    assert response.json == [{
+        'date': 'Sat 02 Mar 2024',
+        'height': pytest.approx(90.0),
+        'variant': 'CMJ',
+        'weight': pytest.approx(80.0 * 2.20462),
+        'note': None
+    }]
+
+
+def test_get_summary_without_jumps(client, auth_header):
+    response = client.get('/api/summary', headers=auth_header)
+
+    assert response.status_code == 200
+    assert response.json == {
+        'num-records': 0,
+        'num-days': 0,
+        'highest-jump': None,
+        'last-jump': None,
+        'improvement': {'6-months': None, '12-months': None, '24-months': None}
+    }
+
+
+def test_get_summary_is_fresh_in_every_worker(client, other_client, auth_header, jumps):
+    assert other_client.get('/api/summary', headers=auth_header).json['num-records'] == 5
+
+    response = client.post(
+        '/api/record-jump',
+        json={'variant': 'MAX', 'hang-time': 0.6, 'body-weight': 80.0},
+        headers=auth_header
+    )
+
+    assert response.status_code == 200
+    assert client.get('/api/summary', headers=auth_header).json['num-records'] == 6
+    assert other_client.get('/api/summary', headers=auth_header).json['num-records'] == 6
+
+
+def test_get_plot_etag_changes_in_every_worker(client, other_client, auth_header, jumps):
+    etag = other_client.get('/api/plot', headers=auth_header).headers['ETag']
+    revalidation = {**auth_header, 'If-None-Match': etag}
+
+    assert other_client.get('/api/plot', headers=revalidation).status_code == 304
+
+    client.post(
+        '/api/record-jump',
+        json={'variant': 'MAX', 'hang-time': 0.6, 'body-weight': 80.0},
+        headers=auth_header
+    )
+    response = other_client.get('/api/plot', headers=revalidation)
+
+    assert response.status_code == 200
+    assert response.mimetype == 'image/png'
+    assert response.headers['ETag'] != etag
+
+
+def test_record_jump_without_dialect_upsert(app, client, auth_header, jumps, monkeypatch):
+    monkeypatch.setattr(utils, 'SUMMARY_UPSERTS', {})
+    record(app, [
+        (datetime(2024, 3, 2, 12), 'MAX', 0.80),
+        (datetime(2024, 3, 2, 13), 'MAX', 0.60),
+        (datetime(2024, 3, 3, 9), 'MAX', 0.50),
+    ])
+    response = client.post(
+        '/api/record-jump',
+        json={'variant': 'MAX', 'hang-time': 0.6, 'body-weight': 80.0},
+        headers=auth_header
+    )
+
+    assert response.status_code == 200
+    with app.app_context():
+        summaries = db.session.query(
+            DailyJumpSummary.day,
+            DailyJumpSummary.max_height,
+            DailyJumpSummary.sum_height,
+            DailyJumpSummary.count
+        ).filter_by(variant='MAX').order_by(DailyJumpSummary.day).all()
+
+    assert [tuple(summary) for summary in summaries[:3]] == [
+        (date(2024, 3, 1), 0.70, pytest.approx(1.86), 3),
+        (date(2024, 3, 2), 0.80, pytest.approx(1.80), 3),
+        (date(2024, 3, 3), 0.50, 0.50, 1),
+    ]
+    assert summaries[3].count == 1
+
+
+@pytest.mark.parametrize('query', [
+    'limit=%C2%B2',
+    'limit=2&after-ts=2024-03-01T09:00:00&after-id=%C2%B2',
+])
+def test_get_jumps_rejects_non_decimal_digits(client, auth_header, query):
+    response = client.get(f'/api/jumps?{query}', headers=auth_header)
+
+    assert response.status_code == 400
+
+
+def test_get_jumps_pages_with_unencoded_cursor(client, auth_header, jumps):
+    dates = []
+    query = 'limit=2'
+    while query:
+        page = client.get(f'/api/jumps?{query}', headers=auth_header)
+        assert page.status_code == 200
+        dates += [jump['date'] for jump in page.json['items']]
+        cursor = page.json['next']
+        query = cursor and f"limit=2&after-ts={cursor['after-ts']}&after-id={cursor['after-id']}"
+
+    assert len(dates) == 5
+    assert dates == sorted(dates, key=lambda day: datetime.strptime(day, '%a %d %b %Y'))
+
+
+@pytest.mark.parametrize('endpoint', ['/api/register', '/api/login', '/api/record-jump'])
+@pytest.mark.parametrize('body', ['[1]', '"x"', '3', 'null', '{'])
+def test_non_object_bodies_are_rejected(client, auth_header, endpoint, body):
+    response = client.post(
+        endpoint,
+        data=body,
+        content_type='application/json',
+        headers=auth_header
+    )
+
+    assert response.status_code == 400
@@ -0,0 +1,39 @@
+"""
+This module tests the plot rendering in utils.py.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import utils
+
+
+def daily_jumps(count):
+    start = utils.utc_now().replace(tzinfo=None) - timedelta(days=count)
+    return [(start + timedelta(days=i), 0.5 + 0.01 * i) for i in range(count)]
+
+
+@pytest.mark.parametrize('image_format, signature', [
+    ('png', b'\x89PNG\r\n\x1a\n'),
+    ('svg', b'<?xml'),
+])
+@pytest.mark.parametrize('count', [0, 1, 30])
+def test_render_plot(image_format, signature, count):
+    image = utils.render_plot(daily_jumps(count), 100.0, -5, 'cm', 1, image_format)
+
+    assert image.startswith(signature)
+
+
+def test_render_plot_reuses_figure_without_leaking_lines():
+    utils.render_plot(daily_jumps(30), 1.0, 0, 'm', 2)
+    utils.render_plot(daily_jumps(5), 1.0, 0, 'm', 2)
+
+    assert len(utils._plot_state.axes.collections) == 1
+    assert utils._plot_state.axes.get_ylabel() == 'jump height (m)'
+
+
+def test_render_plot_accepts_naive_datetimes():
+    jumps = [(datetime(2024, 1, 1, 23), 0.5), (datetime(2024, 1, 2, 1), 0.6)]
+
+    assert utils.render_plot(jumps, 1.0, 14, 'm', 1).startswith(b'\x89PNG')